@@ -2,21 +2,25 @@
 
 Uses the InfluxDB v2 HTTP write API directly (line protocol) to avoid
 dependency on influxdb-client which has import issues on Python 3.13.
+Serializing line protocol inline also keeps the whole ingest on the event
+loop — no per-point client objects and no executor hop for the write.
 """
 
 from __future__ import annotations
 
+import asyncio
+import gzip
 import json
 import logging
 import time
-from datetime import datetime, timezone
+from datetime import datetime
 from urllib.parse import quote
 
+import aiohttp
 from aiohttp import web
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .const import (
     CONF_INFLUXDB_BUCKET,
@@ -28,78 +32,208 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# orjson decodes multi-MB Health Auto Export payloads 3-10x faster than
+# stdlib json with far less garbage. Fall back to stdlib if unavailable.
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = None
+
+# Coalescing window for concurrent ingests: requests arriving within this
+# window (or until the buffered bodies reach the byte cap) merge into one
+# InfluxDB write. HAE syncs in bursts and is not latency-sensitive.
+_FLUSH_WINDOW_S = 0.2
+_FLUSH_MAX_BYTES = 256 * 1024
+
 # Fields that are not numeric values — skip when building InfluxDB points
 SKIP_FIELDS = {"date", "source", "startDate"}
 # String-valued fields to store as tags instead of fields
 STRING_FIELDS = {"inBedStart", "inBedEnd", "sleepStart", "sleepEnd", "value", "endDate", "start", "end", "context"}
 
 
-def parse_timestamp(date_str: str) -> datetime:
-    """Parse Health Auto Export date strings like '2026-01-19 00:00:00 -0500'."""
-    try:
-        return datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S %z")
-    except ValueError:
-        return datetime.fromisoformat(date_str)
+# Cache of UTC-offset seconds keyed by the "±HHMM" suffix — payloads use a
+# single offset, so this avoids re-parsing it per data point.
+_OFFSET_CACHE: dict[str, int] = {}
+
+
+def _days_from_civil(y: int, m: int, d: int) -> int:
+    """Days since 1970-01-01 for a proleptic Gregorian date (Hinnant's formula)."""
+    y -= m <= 2
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * (m + (-3 if m > 2 else 9)) + 2) // 5 + d - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def parse_epoch_s(date_str: str) -> int:
+    """Parse a Health Auto Export date string to epoch seconds.
+
+    HAE dates look like '2026-01-19 00:00:00 -0500'. strptime re-tokenizes its
+    format string on every call, and line protocol only needs the epoch — so
+    slice the fixed-width format directly and do the calendar math in integer
+    space, skipping the datetime/timedelta/tzinfo allocations entirely. Falls
+    back to fromisoformat on shape mismatch.
+    """
+    if len(date_str) == 25 and date_str[4] == "-" and date_str[10] == " " and date_str[19] == " ":
+        try:
+            offset = date_str[20:25]
+            offset_s = _OFFSET_CACHE.get(offset)
+            if offset_s is None:
+                sign = -1 if offset[0] == "-" else 1
+                offset_s = sign * (int(offset[1:3]) * 3600 + int(offset[3:5]) * 60)
+                _OFFSET_CACHE[offset] = offset_s
+            days = _days_from_civil(int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]))
+            return (
+                days * 86400
+                + int(date_str[11:13]) * 3600
+                + int(date_str[14:16]) * 60
+                + int(date_str[17:19])
+                - offset_s
+            )
+        except ValueError:
+            pass
+    return int(datetime.fromisoformat(date_str).timestamp())
+
+
+# Precompiled translate tables: one C-level pass instead of chained
+# .replace() calls that each rescan and reallocate the string.
+_TAG_ESCAPE = str.maketrans({"\\": "\\\\", " ": "\\ ", ",": "\\,", "=": "\\="})
+_FIELD_ESCAPE = str.maketrans({"\\": "\\\\", '"': '\\"'})
 
 
 def _escape_tag(value: str) -> str:
     """Escape tag key/value for line protocol."""
-    return value.replace("\\", "\\\\").replace(" ", "\\ ").replace(",", "\\,").replace("=", "\\=")
+    return value.translate(_TAG_ESCAPE)
 
 
 def _escape_field_str(value: str) -> str:
     """Escape a string field value for line protocol."""
-    return value.replace("\\", "\\\\").replace('"', '\\"')
+    return value.translate(_FIELD_ESCAPE)
+
+
+# STRING_FIELDS keys pre-escaped once — they never change at runtime
+_ESC_STRING_KEYS = {key: _escape_tag(key) for key in STRING_FIELDS}
+
 
+def _probe_schema(dp: dict) -> tuple[tuple[tuple[str, str], ...], tuple[tuple[str, str], ...], int]:
+    """Classify a data point's keys once so later points skip the checks.
 
-def build_line_protocol(metrics: list[dict]) -> list[str]:
-    """Convert Health Auto Export metrics into InfluxDB line protocol strings."""
-    lines = []
+    HAE data points within a metric share a fixed key set, so the numeric
+    field keys (with pre-lowered names) and present string-tag keys (with
+    pre-escaped names) observed on one point apply to the rest. Returns
+    (numeric_keys, string_keys, key_count); a key-count mismatch on a later
+    point signals a schema change and triggers a re-probe.
+    """
+    numeric = tuple(
+        (key, key.lower())
+        for key, value in dp.items()
+        if key not in SKIP_FIELDS and key not in STRING_FIELDS and isinstance(value, (int, float))
+    )
+    strings = tuple((key, esc) for key, esc in _ESC_STRING_KEYS.items() if key in dp)
+    return numeric, strings, len(dp)
+
+
+def build_line_protocol(
+    metrics: list[dict], schema_cache: dict[str, tuple] | None = None
+) -> tuple[bytes, int]:
+    """Convert Health Auto Export metrics into an InfluxDB line protocol payload.
+
+    Returns the UTF-8 encoded payload and the number of points in it.
+    Accumulating into a bytearray avoids building one big str and then
+    re-encoding it on send — for multi-MB payloads that halves peak memory.
+
+    schema_cache, keyed by metric name, carries probed key classifications
+    across calls; a metric's schema is stable between syncs, so repeat
+    requests skip even the first-point probe. Stale entries are replaced
+    whenever a point's key count or key set deviates.
+    """
+    buf = bytearray()
+    count = 0
+    # Local bindings: LOAD_FAST instead of a global lookup per data point
+    escape_tag = _escape_tag
+    parse_epoch = parse_epoch_s
     for metric in metrics:
         name = metric.get("name", "unknown")
         units = metric.get("units", "")
 
+        # name and units are constant per metric — bake them into a prefix
+        # once so each point only appends its dynamic tags
+        prefix = f"{escape_tag(name)},units={escape_tag(units)}" if units else escape_tag(name)
+
+        schema = schema_cache.get(name) if schema_cache is not None else None
+        metric_lines = []
+        append_line = metric_lines.append
         for dp in metric.get("data", []):
             date_str = dp.get("date") or dp.get("startDate")
             if not date_str:
                 continue
 
             try:
-                ts = parse_timestamp(date_str)
+                ts_seconds = parse_epoch(date_str)
             except (ValueError, TypeError):
                 _LOGGER.warning("Skipping data point with unparseable date: %s", date_str)
                 continue
 
-            # Build tags
-            tags = []
+            if schema is None or len(dp) != schema[2]:
+                schema = _probe_schema(dp)
+                if schema_cache is not None:
+                    schema_cache[name] = schema
+            numeric_keys, string_keys = schema[0], schema[1]
+
+            # Dynamic tags only — the measurement/units prefix is prebuilt
+            extra_tags = ""
             source = dp.get("source")
             if source:
-                tags.append(f"source={_escape_tag(source)}")
-            if units:
-                tags.append(f"units={_escape_tag(units)}")
-            for key in STRING_FIELDS:
+                extra_tags += f",source={escape_tag(source)}"
+            for key, escaped_key in string_keys:
                 val = dp.get(key)
                 if isinstance(val, str) and val:
-                    tags.append(f"{_escape_tag(key)}={_escape_tag(val)}")
+                    extra_tags += f",{escaped_key}={escape_tag(val)}"
 
-            # Build fields
-            fields = []
-            for key, value in dp.items():
-                if key in SKIP_FIELDS or key in STRING_FIELDS:
-                    continue
-                if isinstance(value, (int, float)):
-                    fields.append(f"{key.lower()}={float(value)}")
+            # Build fields from the probed keys — no set membership or
+            # .lower() per key; a missing key means the schema shifted.
+            # Values must stay float-typed in InfluxDB, so ints are emitted
+            # as "<n>.0" (pure int formatting, no float() or dtoa) and
+            # floats pass straight through without a redundant float() call.
+            try:
+                fields = []
+                append_field = fields.append
+                for key, lowered in numeric_keys:
+                    value = dp[key]
+                    cls = value.__class__
+                    if cls is int:
+                        append_field(f"{lowered}={value}.0")
+                    elif cls is float:
+                        append_field(f"{lowered}={value}")
+                    elif isinstance(value, (int, float)):  # bool, int/float subclasses
+                        append_field(f"{lowered}={float(value)}")
+            except KeyError:
+                schema = _probe_schema(dp)
+                if schema_cache is not None:
+                    schema_cache[name] = schema
+                fields = [f"{lowered}={float(dp[key])}" for key, lowered in schema[0]]
 
             if not fields:
                 continue
 
             # measurement[,tag=val...] field=val[,field=val...] timestamp
-            tag_str = "," + ",".join(tags) if tags else ""
-            field_str = ",".join(fields)
-            ts_seconds = int(ts.timestamp())
-            lines.append(f"{_escape_tag(name)}{tag_str} {field_str} {ts_seconds}")
+            append_line(f"{prefix}{extra_tags} {','.join(fields)} {ts_seconds}")
+
+        # One join + encode per metric instead of per point — for a 10k-point
+        # metric that is one C-level UTF-8 pass rather than 10k small ones
+        if metric_lines:
+            buf += "\n".join(metric_lines).encode()
+            buf += b"\n"
+            count += len(metric_lines)
 
-    return lines
+    if buf:
+        del buf[-1]  # strip trailing newline
+    return bytes(buf), count
 
 
 class HealthIngestView(HomeAssistantView):
@@ -109,31 +243,109 @@ class HealthIngestView(HomeAssistantView):
     name = "api:healthrip:ingest"
     requires_auth = True
 
-    def __init__(self, hass: HomeAssistant, config_data: dict) -> None:
-        """Initialize with InfluxDB config."""
+    def __init__(self, hass: HomeAssistant, config_data: dict, session: aiohttp.ClientSession) -> None:
+        """Initialize with InfluxDB config and a dedicated write session."""
         self._config = config_data
         self._hass = hass
+        self._session = session
+        self._queue: asyncio.Queue[tuple[bytes, asyncio.Future[None]]] = asyncio.Queue()
+        # Probed metric schemas, reused across requests (see build_line_protocol)
+        self._schema_cache: dict[str, tuple] = {}
+
+        # The write URL and headers never change — build them once instead
+        # of quoting org/bucket and allocating a headers dict per request
+        url = config_data[CONF_INFLUXDB_URL].rstrip("/")
+        org = quote(config_data[CONF_INFLUXDB_ORG])
+        bucket = quote(config_data[CONF_INFLUXDB_BUCKET])
+        self._ping_url = f"{url}/ping"
+        self._write_url = f"{url}/api/v2/write?org={org}&bucket={bucket}&precision=s"
+        base_headers = {
+            "Authorization": f"Token {config_data[CONF_INFLUXDB_TOKEN]}",
+            "Content-Type": "text/plain; charset=utf-8",
+        }
+        self._headers = base_headers
+        self._headers_gzip = {**base_headers, "Content-Encoding": "gzip"}
+
+    def json(self, result, status_code: int = 200, headers: dict | None = None) -> web.Response:
+        """Return a JSON response, serialized with orjson when available."""
+        if _json_dumps is None:
+            return super().json(result, status_code, headers=headers)
+        return web.Response(
+            body=_json_dumps(result),
+            status=status_code,
+            content_type="application/json",
+            headers=headers,
+        )
 
-    async def _write_to_influx(self, body: str) -> None:
+    async def _enqueue_write(self, payload: bytes) -> None:
+        """Hand a payload to the coalescing flusher and wait for its write."""
+        fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        await self._queue.put((payload, fut))
+        await fut
+
+    async def async_flush_loop(self) -> None:
+        """Merge queued payloads into batched InfluxDB writes.
+
+        Waits for the first payload, then keeps the batch open for the flush
+        window (or until the byte cap) so a burst of syncs becomes one POST.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            total = len(batch[0][0])
+            deadline = loop.time() + _FLUSH_WINDOW_S
+            while total < _FLUSH_MAX_BYTES:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                total += len(item[0])
+
+            body = b"\n".join(payload for payload, _ in batch)
+            try:
+                await self._write_to_influx(body)
+            except Exception as err:  # noqa: BLE001 — reported via the futures
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(err)
+            else:
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_result(None)
+
+    async def _write_to_influx(self, body: bytes) -> None:
         """Write line protocol data to InfluxDB via HTTP API."""
-        url = self._config[CONF_INFLUXDB_URL].rstrip("/")
-        bucket = quote(self._config[CONF_INFLUXDB_BUCKET])
-        org = quote(self._config[CONF_INFLUXDB_ORG])
-        token = self._config[CONF_INFLUXDB_TOKEN]
-
-        session = async_get_clientsession(self._hass)
-        resp = await session.post(
-            f"{url}/api/v2/write?org={org}&bucket={bucket}&precision=s",
-            headers={
-                "Authorization": f"Token {token}",
-                "Content-Type": "text/plain; charset=utf-8",
-            },
+        # InfluxDB v2 accepts gzipped line protocol — worthwhile above ~4KB
+        if len(body) > 4096:
+            body = gzip.compress(body)
+            headers = self._headers_gzip
+        else:
+            headers = self._headers
+
+        resp = await self._session.post(
+            self._write_url,
+            headers=headers,
             data=body,
         )
         if resp.status not in (200, 204):
             text = await resp.text()
             raise RuntimeError(f"InfluxDB write failed ({resp.status}): {text}")
 
+    async def async_warm_connection(self) -> None:
+        """Pre-open the InfluxDB connection so the first ingest skips the handshake.
+
+        The pooled session keeps the connection alive afterwards; failures here
+        are logged and otherwise ignored — the first real write will surface them.
+        """
+        try:
+            await self._session.get(self._ping_url, timeout=aiohttp.ClientTimeout(total=5))
+        except Exception as err:
+            _LOGGER.debug("InfluxDB connection warm-up failed: %s", err)
+
     async def post(self, request: web.Request) -> web.Response:
         """Handle incoming health data."""
         request_start = time.monotonic()
@@ -143,7 +355,7 @@ class HealthIngestView(HomeAssistantView):
             request._client_max_size = 50 * 1024 * 1024  # 50 MB
             raw = await request.read()
             _LOGGER.debug("Received %d bytes (content-length: %s)", len(raw), request.content_length)
-            body = json.loads(raw)
+            body = _json_loads(raw)
         except Exception as exc:
             _LOGGER.error("Failed to parse request body: %s: %s (content-type: %s, content-length: %s, bytes read: %d)",
                           type(exc).__name__, exc, request.content_type, request.content_length,
@@ -159,59 +371,94 @@ class HealthIngestView(HomeAssistantView):
             await self._write_telemetry(0, 0, elapsed)
             return self.json({"status": "ok", "points_written": 0})
 
-        lines = build_line_protocol(metrics)
-        if not lines:
+        payload, point_count = build_line_protocol(metrics, self._schema_cache)
+        if not point_count:
             elapsed = time.monotonic() - request_start
             await self._write_telemetry(len(metrics), 0, elapsed)
             return self.json({"status": "ok", "points_written": 0})
 
         try:
-            write_start = time.monotonic()
-            await self._write_to_influx("\n".join(lines))
-            write_dur = time.monotonic() - write_start
+            # Piggyback the telemetry point on the data write — one POST
+            # instead of two. Covers everything up to the write itself.
+            elapsed = time.monotonic() - request_start
+            payload += b"\n" + self._telemetry_line(len(metrics), point_count, elapsed).encode()
+            await self._enqueue_write(payload)
         except Exception as err:
             _LOGGER.error("InfluxDB write failed: %s", err)
             elapsed = time.monotonic() - request_start
-            await self._write_telemetry(len(metrics), len(lines), elapsed, error=type(err).__name__)
+            await self._write_telemetry(len(metrics), point_count, elapsed, error=type(err).__name__)
             return self.json(
                 {"error": f"InfluxDB write failed: {err}"}, status_code=502
             )
 
         elapsed = time.monotonic() - request_start
-        _LOGGER.info("Wrote %d points across %d metrics (%.1fs)", len(lines), len(metrics), elapsed)
-        await self._write_telemetry(len(metrics), len(lines), elapsed, write_dur)
-        return self.json({"status": "ok", "points_written": len(lines)})
+        _LOGGER.info("Wrote %d points across %d metrics (%.1fs)", point_count, len(metrics), elapsed)
+        return self.json({"status": "ok", "points_written": point_count})
+
+    def _telemetry_line(
+        self,
+        metric_count: int,
+        point_count: int,
+        total_dur: float,
+        error: str = "",
+    ) -> str:
+        """Build the ingest telemetry point as a line protocol string."""
+        now_s = int(time.time())
+        tags = ",error=" + _escape_tag(error) if error else ""
+        success = 0.0 if error else 1.0
+        return (
+            f"ingest_request{tags} "
+            f"points={float(point_count)},"
+            f"metrics={float(metric_count)},"
+            f"total_duration_s={round(total_dur, 3)},"
+            f"success={success} "
+            f"{now_s}"
+        )
 
     async def _write_telemetry(
         self,
         metric_count: int,
         point_count: int,
         total_dur: float,
-        write_dur: float = 0.0,
         error: str = "",
     ) -> None:
-        """Write ingest telemetry to InfluxDB. Failures are logged but not raised."""
+        """Write ingest telemetry to InfluxDB. Failures are logged but not raised.
+
+        Only used on paths without a data write to piggyback on (errors,
+        empty payloads).
+        """
         try:
-            now_s = int(datetime.now(timezone.utc).timestamp())
-            tags = ",error=" + _escape_tag(error) if error else ""
-            success = 0.0 if error else 1.0
-            line = (
-                f"ingest_request{tags} "
-                f"points={float(point_count)},"
-                f"metrics={float(metric_count)},"
-                f"total_duration_s={round(total_dur, 3)},"
-                f"write_duration_s={round(write_dur, 3)},"
-                f"success={success} "
-                f"{now_s}"
-            )
-            await self._write_to_influx(line)
+            line = self._telemetry_line(metric_count, point_count, total_dur, error)
+            await self._write_to_influx(line.encode())
         except Exception as err:
             _LOGGER.warning("Failed to write telemetry: %s", err)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Health Data Ingester from a config entry."""
-    hass.http.register_view(HealthIngestView(hass, dict(entry.data)))
+    # Dedicated session for InfluxDB writes: a long keep-alive and a small
+    # per-host limit keep one warm connection pinned to the database instead
+    # of competing with the shared HA session's pool churn.
+    session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit_per_host=4,
+            keepalive_timeout=300,
+            enable_cleanup_closed=True,
+        )
+    )
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = session
+
+    view = HealthIngestView(hass, dict(entry.data), session)
+    hass.http.register_view(view)
+    # Open the InfluxDB connection eagerly; the pooled session reuses it
+    # across requests so ingests never pay the TCP/TLS handshake.
+    entry.async_create_background_task(
+        hass, view.async_warm_connection(), "healthrip_warm_connection"
+    )
+    # Cancelled automatically when the entry unloads
+    entry.async_create_background_task(
+        hass, view.async_flush_loop(), "healthrip_flush_loop"
+    )
     _LOGGER.info(
         "Health Data Ingester ready at /api/healthrip/ingest"
     )
@@ -220,4 +467,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    session = hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+    if session is not None:
+        await session.close()
     return True
@@ -22,15 +22,20 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import base64
 import json
 import logging
 import os
+import random
 import signal
 import socket
 import sys
+import threading
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -39,6 +44,17 @@ from influxdb_client.client.write_api import SYNCHRONOUS
 
 log = logging.getLogger("backfill")
 
+# orjson parses the multi-MB day responses 2-5x faster than stdlib json and
+# takes bytes directly, skipping a full UTF-8 decode pass per response.
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps  # returns bytes
+except ImportError:
+    _loads = json.loads
+    _dumps = None
+
 # ---------------------------------------------------------------------------
 # Shared logic (mirrored from custom_components/healthrip/__init__.py)
 # ---------------------------------------------------------------------------
@@ -47,20 +63,122 @@ SKIP_FIELDS = {"date", "source", "startDate"}
 STRING_FIELDS = {"inBedStart", "inBedEnd", "sleepStart", "sleepEnd", "value", "endDate", "start", "end", "context"}
 
 
+# timezone objects per "±HHMM" suffix — a handful of values per export
+_TZ_CACHE: dict[str, timezone] = {}
+
+
+@lru_cache(maxsize=4096)
 def parse_timestamp(date_str: str) -> datetime:
-    """Parse Health Auto Export date strings like '2026-01-19 00:00:00 -0500'."""
+    """Parse Health Auto Export date strings like '2026-01-19 00:00:00 -0500'.
+
+    The format is fixed-width, so slicing the components out directly is
+    an order of magnitude faster than strptime's per-call format
+    interpretation. Memoized: HAE emits the same timestamp across many
+    metrics in a window, so repeats far outnumber unique strings.
+    """
     try:
-        return datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S %z")
-    except ValueError:
+        tz_str = date_str[20:]
+        tz = _TZ_CACHE.get(tz_str)
+        if tz is None:
+            sign = -1 if tz_str[0] == "-" else 1
+            seconds = sign * (int(tz_str[1:3]) * 3600 + int(tz_str[3:5]) * 60)
+            tz = _TZ_CACHE[tz_str] = timezone(timedelta(seconds=seconds))
+        return datetime(
+            int(date_str[0:4]),
+            int(date_str[5:7]),
+            int(date_str[8:10]),
+            int(date_str[11:13]),
+            int(date_str[14:16]),
+            int(date_str[17:19]),
+            tzinfo=tz,
+        )
+    except (ValueError, IndexError):
         return datetime.fromisoformat(date_str)
 
 
-def build_points(metrics: list[dict]) -> list[Point]:
-    """Convert Health Auto Export metrics into InfluxDB points."""
-    points = []
+def _days_from_civil(y: int, m: int, d: int) -> int:
+    """Days since 1970-01-01 for a proleptic Gregorian date (Hinnant's formula)."""
+    y -= m <= 2
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * (m + (-3 if m > 2 else 9)) + 2) // 5 + d - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+# UTC-offset seconds keyed by the "±HHMM" suffix — an export uses a
+# handful of offsets across millions of points
+_OFFSET_CACHE: dict[str, int] = {}
+
+
+@lru_cache(maxsize=4096)
+def parse_epoch_s(date_str: str) -> int:
+    """Parse a Health Auto Export date string straight to epoch seconds.
+
+    Line protocol only needs the integer timestamp, so the calendar math
+    happens in integer space — no datetime/timedelta/tzinfo allocations
+    per point (mirrors parse_epoch_s in the healthrip component). Falls
+    back to the full parser on shape mismatch.
+    """
+    if len(date_str) == 25 and date_str[4] == "-" and date_str[10] == " " and date_str[19] == " ":
+        try:
+            offset = date_str[20:25]
+            offset_s = _OFFSET_CACHE.get(offset)
+            if offset_s is None:
+                sign = -1 if offset[0] == "-" else 1
+                offset_s = sign * (int(offset[1:3]) * 3600 + int(offset[3:5]) * 60)
+                _OFFSET_CACHE[offset] = offset_s
+            days = _days_from_civil(int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]))
+            return (
+                days * 86400
+                + int(date_str[11:13]) * 3600
+                + int(date_str[14:16]) * 60
+                + int(date_str[17:19])
+                - offset_s
+            )
+        except ValueError:
+            pass
+    return int(parse_timestamp(date_str).timestamp())
+
+
+# key.lower() results, shared across calls — the same ~50 metric key names
+# repeat across millions of data points
+_LOWER_CACHE: dict[str, str] = {}
+
+# One C-level pass instead of chained .replace() calls
+_TAG_ESCAPE = str.maketrans({"\\": "\\\\", " ": "\\ ", ",": "\\,", "=": "\\="})
+
+
+def _escape_tag(value: str) -> str:
+    """Escape a tag key/value for line protocol."""
+    return value.translate(_TAG_ESCAPE)
+
+
+def build_lines(metrics: list[dict]) -> list[str]:
+    """Convert Health Auto Export metrics into InfluxDB line protocol rows.
+
+    Emits the wire format directly — each influxdb-client Point carried
+    tag/field dicts that the client re-serialized to line protocol on
+    write anyway, so the object layer (and its per-field method-call and
+    rebind overhead) was pure overhead at backfill volumes.
+    write_api.write accepts these strings as records. Point objects
+    survive only in the cold telemetry helpers, where fluent chaining
+    costs nothing measurable.
+    """
+    lines = []
+    # Local bindings keep the per-field hot loop on LOAD_FAST instead of
+    # repeated global/attribute lookups
+    skip_fields = SKIP_FIELDS
+    string_fields = STRING_FIELDS
+    numeric_types = (int, float)
+    lower_cache = _LOWER_CACHE
+    escape = _escape_tag
+    parse = parse_epoch_s
     for metric in metrics:
         name = metric.get("name", "unknown")
         units = metric.get("units", "")
+        # name and units are constant per metric — escape once
+        prefix = f"{escape(name)},units={escape(units)}" if units else escape(name)
 
         for dp in metric.get("data", []):
             date_str = dp.get("date") or dp.get("startDate")
@@ -68,35 +186,35 @@ def build_points(metrics: list[dict]) -> list[Point]:
                 continue
 
             try:
-                ts = parse_timestamp(date_str)
+                epoch_s = parse(date_str)
             except (ValueError, TypeError):
                 log.warning("Skipping data point with unparseable date: %s", date_str)
                 continue
 
-            point = Point(name).time(ts, WritePrecision.S)
-
+            tags = ""
             source = dp.get("source")
             if source:
-                point = point.tag("source", source)
-            if units:
-                point = point.tag("units", units)
+                tags += f",source={escape(source)}"
 
-            field_count = 0
+            fields = []
             for key, value in dp.items():
-                if key in SKIP_FIELDS:
+                if key in skip_fields:
                     continue
-                if key in STRING_FIELDS:
-                    if isinstance(value, str):
-                        point = point.tag(key, value)
+                if key in string_fields:
+                    if isinstance(value, str) and value:
+                        tags += f",{escape(key)}={escape(value)}"
                     continue
-                if isinstance(value, (int, float)):
-                    point = point.field(key.lower(), float(value))
-                    field_count += 1
+                if isinstance(value, numeric_types):
+                    lowered = lower_cache.get(key)
+                    if lowered is None:
+                        lowered = lower_cache[key] = key.lower()
+                    fields.append(f"{lowered}={float(value)}")
 
-            if field_count > 0:
-                points.append(point)
+            if fields:
+                # measurement[,tag=val...] field=val[,field=val...] timestamp
+                lines.append(f"{prefix}{tags} {','.join(fields)} {epoch_s}")
 
-    return points
+    return lines
 
 
 # ---------------------------------------------------------------------------
@@ -104,73 +222,164 @@ def build_points(metrics: list[dict]) -> list[Point]:
 # ---------------------------------------------------------------------------
 
 
-def query_health_metrics(
-    host: str,
-    port: int,
-    start: str,
-    end: str,
-    metrics: str = "",
-    timeout: int = 60,
-) -> dict:
-    """Send a health_metrics query to Health Auto Export TCP server."""
-    request = {
-        "jsonrpc": "2.0",
-        "id": str(uuid.uuid4()),
-        "method": "callTool",
-        "params": {
-            "name": "health_metrics",
-            "arguments": {
-                "start": start,
-                "end": end,
-                "metrics": metrics,
-                "interval": "",
-                "aggregate": False,
+class HaeClient:
+    """TCP client for the Health Auto Export MCP server.
+
+    The server frames a request by the client half-closing the connection
+    (SHUT_WR) and frames its response by closing it, so each connection
+    carries exactly one exchange — requests cannot be pipelined over a
+    persistent socket. The client instead centralizes socket setup so
+    every query gets the same options and timeout.
+    """
+
+    def __init__(self, host: str, port: int, timeout: int = 60):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        # Raw byte size of the most recent response. Only meaningful
+        # after a serial query — concurrent window workers clobber it.
+        self.last_response_size = 0
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        # The ~200-byte JSON-RPC request must go out immediately, not sit
+        # in a Nagle buffer waiting for an ACK that never piggybacks
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # Responses are multi-MB; a 1MB kernel receive buffer keeps the
+        # phone streaming instead of stalling on window updates
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        sock.connect((self.host, self.port))
+        return sock
+
+    def query(self, start: str, end: str, metrics: str = "") -> dict:
+        """Send a health_metrics query and return the decoded response."""
+        request = {
+            "jsonrpc": "2.0",
+            "id": str(uuid.uuid4()),
+            "method": "callTool",
+            "params": {
+                "name": "health_metrics",
+                "arguments": {
+                    "start": start,
+                    "end": end,
+                    "metrics": metrics,
+                    "interval": "",
+                    "aggregate": False,
+                },
             },
-        },
-    }
+        }
 
-    payload = json.dumps(request).encode("utf-8")
-    log.debug("TCP request to %s:%d: %s", host, port, json.dumps(request, indent=2))
+        payload = json.dumps(request).encode("utf-8")
+        if log.isEnabledFor(logging.DEBUG):
+            # Pretty-printing is only worth paying for when debug is on
+            log.debug("TCP request to %s:%d: %s", self.host, self.port, json.dumps(request, indent=2))
 
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    sock.settimeout(timeout)
-    try:
-        sock.connect((host, port))
-        sock.sendall(payload)
-        sock.shutdown(socket.SHUT_WR)
+        sock = self._connect()
+        try:
+            sock.sendall(payload)
+            sock.shutdown(socket.SHUT_WR)
+
+            # Read into one growable buffer via a reusable scratch view —
+            # no per-chunk bytes objects and no final b"".join copy. The
+            # 256KB scratch cuts recv syscalls 4x on multi-MB responses.
+            buf = bytearray()
+            scratch = memoryview(bytearray(262144))
+            while True:
+                n = sock.recv_into(scratch)
+                if not n:
+                    break
+                buf += scratch[:n]
 
-        chunks = []
-        while True:
-            chunk = sock.recv(65536)
-            if not chunk:
-                break
-            chunks.append(chunk)
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("TCP response (%d bytes): %.500s", len(buf), bytes(buf[:500]).decode("utf-8", "replace"))
+            self.last_response_size = len(buf)
+            return _loads(buf)
+        finally:
+            sock.close()
 
-        raw = b"".join(chunks).decode("utf-8")
-        log.debug("TCP response (%d bytes): %.500s", len(raw), raw)
-        return json.loads(raw)
-    finally:
-        sock.close()
+
+class CircuitBreaker:
+    """Stop hammering the phone once it is clearly gone.
+
+    CLOSED passes queries through; after failure_threshold consecutive
+    failures the breaker trips OPEN and allow_request() refuses until a
+    jittered, exponentially growing wait has elapsed, at which point one
+    HALF_OPEN probe is allowed — success closes the breaker, failure
+    re-opens it for longer.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 3, base_duration: float = 30.0, max_duration: float = 900.0):
+        self.failure_threshold = failure_threshold
+        self.base_duration = base_duration
+        self.max_duration = max_duration
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.opened_at = 0.0
+        self.open_for = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == self.OPEN
+
+    def allow_request(self) -> bool:
+        """True when a query may proceed; flips OPEN to HALF_OPEN after the wait."""
+        if self.state != self.OPEN:
+            return True
+        if time.monotonic() - self.opened_at >= self.open_for:
+            self.state = self.HALF_OPEN
+            return True
+        return False
+
+    def on_success(self) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+
+    def on_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self._trip()
+
+    def _trip(self) -> None:
+        self.trips += 1
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.open_for = min(
+            self.max_duration, self.base_duration * (2 ** (self.trips - 1))
+        ) * random.uniform(0.8, 1.2)
+        self.failures = 0
+        log.debug("Circuit breaker open for %.0fs (trip #%d)", self.open_for, self.trips)
 
 
 def query_with_retry(
-    host: str,
-    port: int,
+    client: HaeClient,
     start: str,
     end: str,
     metrics: str = "",
     retries: int = 3,
-    delay: float = 5.0,
-    timeout: int = 60,
+    base_delay: float = 5.0,
+    max_delay: float = 30.0,
 ) -> dict:
-    """Query with retry on connection errors."""
+    """Query with full-jitter exponential backoff on connection errors.
+
+    Sleeping a random interval in [0, base * 2^attempt] (capped) keeps
+    concurrent retriers — the four window workers, or several clients
+    reconnecting after an outage — from hammering the phone in lockstep.
+    """
     for attempt in range(retries):
         try:
-            return query_health_metrics(host, port, start, end, metrics, timeout)
+            return client.query(start, end, metrics)
         except (ConnectionRefusedError, socket.timeout, OSError) as e:
             if attempt < retries - 1:
+                delay = random.uniform(0.0, min(max_delay, base_delay * (2 ** attempt)))
                 log.warning(
-                    "Attempt %d/%d failed: %s. Retrying in %.0fs...",
+                    "Attempt %d/%d failed: %s. Retrying in %.1fs...",
                     attempt + 1,
                     retries,
                     e,
@@ -181,15 +390,43 @@ def query_with_retry(
                 raise
 
 
+# Response shape detected on the first successful extraction — the
+# server doesn't change formats within a session, so later responses
+# skip shape detection (and its speculative second json parse) entirely
+_RESPONSE_SHAPE: str | None = None
+
+
 def extract_metrics(response: dict) -> list[dict]:
     """Extract metrics list from JSON-RPC response.
 
     Handles both the MCP wrapper format (content[].text with embedded JSON)
     and a direct format where data is at the top level of the result.
     """
+    global _RESPONSE_SHAPE
+
     if "error" in response:
         raise RuntimeError(f"JSON-RPC error: {response['error']}")
 
+    # Fast path on the known shape; any mismatch falls through to the
+    # full detection below
+    if _RESPONSE_SHAPE == "mcp":
+        try:
+            item = response["result"]["content"][0]
+            if item.get("type") == "text":
+                return _loads(item["text"]).get("data", {}).get("metrics", [])
+        except (KeyError, IndexError, TypeError, ValueError):
+            pass
+    elif _RESPONSE_SHAPE == "result":
+        try:
+            return response["result"]["data"].get("metrics", [])
+        except (KeyError, AttributeError):
+            pass
+    elif _RESPONSE_SHAPE == "top":
+        try:
+            return response["data"].get("metrics", [])
+        except (KeyError, AttributeError):
+            pass
+
     result = response.get("result", {})
 
     # MCP tool response: result.content[0].text contains JSON string
@@ -198,23 +435,26 @@ def extract_metrics(response: dict) -> list[dict]:
         for item in content:
             if item.get("type") == "text":
                 try:
-                    inner = json.loads(item["text"])
+                    inner = _loads(item["text"])
                     metrics = inner.get("data", {}).get("metrics", [])
                     if metrics:
+                        _RESPONSE_SHAPE = "mcp"
                         return metrics
-                except (json.JSONDecodeError, AttributeError):
+                except (ValueError, AttributeError):
                     pass
 
     # Direct format: result.data.metrics
     if "data" in result:
         metrics = result["data"].get("metrics", [])
         if metrics:
+            _RESPONSE_SHAPE = "result"
             return metrics
 
     # Top-level data (if response itself is the payload)
     if "data" in response:
         metrics = response["data"].get("metrics", [])
         if metrics:
+            _RESPONSE_SHAPE = "top"
             return metrics
 
     return []
@@ -225,22 +465,70 @@ def extract_metrics(response: dict) -> list[dict]:
 # ---------------------------------------------------------------------------
 
 
+def _bitset_encode(completed: set[str]) -> tuple[str | None, str]:
+    """Pack completed ISO days into a (base date, base64 bitmap) pair.
+
+    One bit per day from the base date: ~456 bytes for a 10-year range
+    versus ~40KB of ISO strings, and membership/count run at C speed for
+    any consumer that keeps the packed form.
+    """
+    if not completed:
+        return None, ""
+    ords = sorted(date.fromisoformat(s).toordinal() for s in completed)
+    base = ords[0]
+    bits = bytearray(((ords[-1] - base) >> 3) + 1)
+    for o in ords:
+        i = o - base
+        bits[i >> 3] |= 1 << (i & 7)
+    return date.fromordinal(base).isoformat(), base64.b64encode(bytes(bits)).decode("ascii")
+
+
+def _bitset_decode(base_iso: str, bits_b64: str) -> list[int]:
+    """Unpack a (base date, base64 bitmap) progress entry into sorted day ordinals."""
+    base = date.fromisoformat(base_iso).toordinal()
+    ords = []
+    for byte_i, byte in enumerate(base64.b64decode(bits_b64)):
+        if byte:
+            for bit in range(8):
+                if byte & (1 << bit):
+                    ords.append(base + byte_i * 8 + bit)
+    return ords
+
+
 class ProgressTracker:
-    """Track which days have been imported, persisted to a JSON file."""
+    """Track which days have been imported, persisted to a JSON file.
+
+    Saves rewrite the whole file, so they are throttled to every
+    save_every completed days; callers force a save at end of pass and
+    on interrupt so at most save_every - 1 days of progress can be
+    re-imported after a crash.
+    """
 
-    def __init__(self, path: str | Path):
+    def __init__(self, path: str | Path, save_every: int = 10):
         self.path = Path(path)
+        self.save_every = save_every
         self.completed: set[str] = set()
         self.points_by_day: dict[str, int] = {}
         self.total_points: int = 0
+        self.earliest_data: str | None = None
         self._dirty = False
+        self._unsaved = 0
 
     def load(self) -> None:
         if self.path.exists():
-            data = json.loads(self.path.read_text())
-            self.completed = set(data.get("completed_days", []))
+            # Read bytes and let orjson skip the str decode pass
+            data = _loads(self.path.read_bytes())
+            if data.get("bits_b64") and data.get("base"):
+                self.completed = {
+                    date.fromordinal(o).isoformat()
+                    for o in _bitset_decode(data["base"], data["bits_b64"])
+                }
+            else:
+                # Pre-bitset format: plain list of ISO day strings
+                self.completed = set(data.get("completed_days", []))
             self.points_by_day = data.get("points_by_day", {})
             self.total_points = data.get("total_points", 0)
+            self.earliest_data = data.get("earliest_data")
             log.info(
                 "Loaded progress: %d days already completed, %d total points",
                 len(self.completed),
@@ -250,16 +538,32 @@ class ProgressTracker:
             log.info("No progress file found, starting fresh")
 
     def save(self) -> None:
+        base_iso, bits_b64 = _bitset_encode(self.completed)
         data = {
-            "completed_days": sorted(self.completed),
+            "base": base_iso,
+            "bits_b64": bits_b64,
             "last_updated": datetime.now(timezone.utc).isoformat(),
+            # Pre-parsed form so readers can diff against time.time()
+            # without a fromisoformat round trip
+            "last_updated_epoch": time.time(),
             "total_completed": len(self.completed),
             "total_points": self.total_points,
+            "earliest_data": self.earliest_data,
             "points_by_day": dict(sorted(self.points_by_day.items())),
         }
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        self.path.write_text(json.dumps(data, indent=2) + "\n")
+        # Write-then-rename so a crash mid-write can't corrupt the file.
+        # No indent on the hot save path — pretty-printing roughly doubles
+        # the bytes and serialize time; import_status.py renders for humans.
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        if _dumps is not None:
+            tmp.write_bytes(_dumps(data))
+        else:
+            with tmp.open("w") as f:
+                json.dump(data, f)
+        os.replace(tmp, self.path)
         self._dirty = False
+        self._unsaved = 0
         log.debug("Progress saved (%d days, %d points)", len(self.completed), self.total_points)
 
     def mark_completed(self, day: date, points: int = 0) -> None:
@@ -268,6 +572,13 @@ class ProgressTracker:
             self.points_by_day[day.isoformat()] = points
             self.total_points += points
         self._dirty = True
+        self._unsaved += 1
+
+    def note_earliest_data(self, day_iso: str) -> None:
+        """Record the oldest day known to contain data."""
+        if self.earliest_data is None or day_iso < self.earliest_data:
+            self.earliest_data = day_iso
+            self._dirty = True
 
     def is_completed(self, day: date) -> bool:
         return day.isoformat() in self.completed
@@ -278,8 +589,8 @@ class ProgressTracker:
             log.info("Progress file deleted")
         self.completed.clear()
 
-    def save_if_dirty(self) -> None:
-        if self._dirty:
+    def save_if_dirty(self, force: bool = False) -> None:
+        if self._dirty and (force or self._unsaved >= self.save_every):
             self.save()
 
 
@@ -288,24 +599,71 @@ class ProgressTracker:
 # ---------------------------------------------------------------------------
 
 
-def write_points(
-    points: list[Point],
-    url: str,
-    token: str,
-    org: str,
-    bucket: str,
-) -> None:
-    """Write a batch of points to InfluxDB."""
-    client = InfluxDBClient(url=url, token=token, org=org)
-    try:
-        write_api = client.write_api(write_options=SYNCHRONOUS)
-        write_api.write(bucket=bucket, record=points)
-    finally:
-        client.close()
+def make_influx_writer(args) -> tuple[InfluxDBClient, object]:
+    """Create the long-lived InfluxDB client and write API.
+
+    One client for the whole run — constructing a client per write pays a
+    TCP(/TLS) handshake and thread-pool setup each time, which dominated
+    the write path when every 6-hour window opened its own connection.
+    """
+    client = InfluxDBClient(url=args.influx_url, token=args.influx_token, org=args.influx_org)
+    return client, client.write_api(write_options=SYNCHRONOUS)
+
+
+def write_points(write_api, bucket: str, points: list) -> None:
+    """Write a batch of records (line protocol rows or Points) through the shared write API."""
+    write_api.write(bucket=bucket, record=points, write_precision=WritePrecision.S)
+
+
+class TelemetryBuffer:
+    """Accumulate telemetry points and flush them in batches.
+
+    Telemetry is one or two points per day plus occasional error and
+    connectivity events — writing each batch-of-one through the API is a
+    round trip per event. Buffering until 50 points or 30 seconds have
+    accumulated collapses those into occasional batched writes; callers
+    flush explicitly at end of pass and on shutdown so nothing is lost.
+    """
+
+    def __init__(self, write_api, bucket: str, max_points: int = 50, max_age: float = 30.0):
+        self.write_api = write_api  # None in dry-run mode
+        self.bucket = bucket
+        self.max_points = max_points
+        self.max_age = max_age
+        self._points: list = []
+        self._last_flush = time.monotonic()
+        # Window workers report from pool threads; guard the shared list
+        self._lock = threading.Lock()
+
+    def add(self, *points) -> None:
+        if self.write_api is None:
+            return
+        with self._lock:
+            self._points.extend(points)
+            due = (
+                len(self._points) >= self.max_points
+                or time.monotonic() - self._last_flush >= self.max_age
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.write_api is None:
+            return
+        with self._lock:
+            batch, self._points = self._points, []
+            self._last_flush = time.monotonic()
+        if not batch:
+            return
+        try:
+            write_points(self.write_api, self.bucket, batch)
+        except Exception as e:
+            log.warning("Failed to write telemetry batch (%d points): %s", len(batch), e)
 
 
 def write_telemetry(
     args,
+    telemetry: TelemetryBuffer,
     tracker: ProgressTracker,
     day: date,
     day_points: int,
@@ -314,13 +672,11 @@ def write_telemetry(
     total_dur: float,
     total_days: int,
 ) -> None:
-    """Write import telemetry to InfluxDB."""
-    if args.dry_run:
-        return
+    """Queue import telemetry for InfluxDB."""
     now = datetime.now(timezone.utc)
     remaining = total_days - len(tracker.completed)
     pct = len(tracker.completed) / total_days * 100 if total_days else 0
-    telemetry_points = [
+    telemetry.add(
         Point("backfill_day")
         .tag("date", day.isoformat())
         .field("points", float(day_points))
@@ -334,41 +690,28 @@ def write_telemetry(
         .field("pct_complete", round(pct, 2))
         .field("total_points", float(tracker.total_points))
         .time(now, WritePrecision.S),
-    ]
-    try:
-        write_points(
-            telemetry_points,
-            args.influx_url,
-            args.influx_token,
-            args.influx_org,
-            args.influx_bucket,
-        )
-    except Exception as e:
-        log.warning("Failed to write telemetry: %s", e)
+    )
 
 
-def write_connectivity(args, online: bool) -> None:
-    """Write a connectivity state change to InfluxDB."""
-    if args.dry_run:
-        return
+def write_connectivity(args, telemetry: TelemetryBuffer, online: bool) -> None:
+    """Queue a connectivity state change for InfluxDB.
+
+    Connectivity transitions are worth seeing promptly, so the buffer is
+    flushed right away.
+    """
     now = datetime.now(timezone.utc)
-    point = (
+    telemetry.add(
         Point("backfill_connectivity")
         .field("online", 1.0 if online else 0.0)
         .time(now, WritePrecision.S)
     )
-    try:
-        write_points([point], args.influx_url, args.influx_token, args.influx_org, args.influx_bucket)
-    except Exception as e:
-        log.warning("Failed to write connectivity telemetry: %s", e)
+    telemetry.flush()
 
 
-def write_error(args, day: date, error: str) -> None:
-    """Write an import error event to InfluxDB."""
-    if args.dry_run:
-        return
+def write_error(args, telemetry: TelemetryBuffer, day: date, error: str) -> None:
+    """Queue an import error event for InfluxDB."""
     now = datetime.now(timezone.utc)
-    point = (
+    telemetry.add(
         Point("backfill_error")
         .tag("date", day.isoformat())
         .tag("error_type", error.split(":")[0].strip() if error else "unknown")
@@ -376,10 +719,6 @@ def write_error(args, day: date, error: str) -> None:
         .field("count", 1.0)
         .time(now, WritePrecision.S)
     )
-    try:
-        write_points([point], args.influx_url, args.influx_token, args.influx_org, args.influx_bucket)
-    except Exception as e:
-        log.warning("Failed to write error telemetry: %s", e)
 
 
 # ---------------------------------------------------------------------------
@@ -395,6 +734,27 @@ def date_range_reverse(start_date: date, end_date: date):
         current -= timedelta(days=1)
 
 
+# (date, iso-string) day lists keyed by range — rebuilt only when the
+# range changes, not on every daemon pass
+_DAY_CACHE: dict[tuple[date, date], list[tuple[date, str]]] = {}
+
+
+def all_days_reverse(start_date: date, end_date: date) -> list[tuple[date, str]]:
+    """Return [(date, iso), ...] newest first, with the iso string computed once.
+
+    Completion checks against tracker.completed are plain `iso in set`
+    lookups, so precomputing the strings here avoids a fresh
+    date.isoformat() allocation per day per pass.
+    """
+    key = (start_date, end_date)
+    days = _DAY_CACHE.get(key)
+    if days is None:
+        days = _DAY_CACHE[key] = [
+            (d, d.isoformat()) for d in date_range_reverse(start_date, end_date)
+        ]
+    return days
+
+
 def format_hae_timestamp(d: date, h: int, m: int, s: int, tz: str) -> str:
     """Format a date+time into HAE timestamp format."""
     return f"{d.isoformat()} {h:02d}:{m:02d}:{s:02d} {tz}"
@@ -501,6 +861,18 @@ examples:
         default=0.5,
         help="Seconds between requests (default: 0.5)",
     )
+    p.add_argument(
+        "--save-every",
+        type=int,
+        default=10,
+        help="Persist progress every N completed days (default: 10)",
+    )
+    p.add_argument(
+        "--max-delay",
+        type=float,
+        default=30.0,
+        help="Cap in seconds for retry backoff (default: 30)",
+    )
     p.add_argument("-v", "--verbose", action="store_true", help="Verbose logging")
     p.add_argument(
         "--daemon",
@@ -534,7 +906,23 @@ examples:
 # Main
 # ---------------------------------------------------------------------------
 
-_interrupted = False
+# Set by the SIGINT handler; Event.wait gives interruptible sleeps
+# without the old 1-second polling loops
+_stop = threading.Event()
+
+# Consecutive empty days (walking backwards from known data) before the
+# rest of the range is assumed to predate the user's Apple Health history
+_EMPTY_TAIL_DAYS = 14
+
+# Whole-day window tuple for single-query days
+_WHOLE_DAY = (0, 0, 0, 23, 59, 59)
+
+# A whole-day response beyond either threshold flips the pass into
+# 4x6h windowed mode; after _SPLIT_RETRY_DAYS the single-query fast
+# path is tried again (older days are usually lighter)
+_SPLIT_BYTES = 10 << 20
+_SPLIT_SECONDS = 15.0
+_SPLIT_RETRY_DAYS = 30
 
 
 def check_phone_reachable(host: str, port: int, timeout: int = 5) -> bool:
@@ -549,16 +937,24 @@ def check_phone_reachable(host: str, port: int, timeout: int = 5) -> bool:
         return False
 
 
-def import_pass(args, tracker: ProgressTracker) -> tuple[int, int, int, bool]:
+def import_pass(
+    args,
+    tracker: ProgressTracker,
+    write_api,
+    telemetry: TelemetryBuffer,
+    breaker: CircuitBreaker | None = None,
+) -> tuple[int, int, int, bool]:
     """Run one import pass over remaining days.
 
     Returns (days_imported, total_points, days_failed, phone_lost).
     phone_lost is True if the pass ended due to network failures (phone went away).
     """
-    global _interrupted
+    if breaker is None:
+        breaker = CircuitBreaker()
 
-    all_days = list(date_range_reverse(args.start, args.end))
-    remaining = [d for d in all_days if not tracker.is_completed(d)]
+    all_days = all_days_reverse(args.start, args.end)
+    completed = tracker.completed
+    remaining = [(d, iso) for d, iso in all_days if iso not in completed]
 
     total = len(all_days)
     done = total - len(remaining)
@@ -581,12 +977,33 @@ def import_pass(args, tracker: ProgressTracker) -> tuple[int, int, int, bool]:
     total_days = len(all_days)
     total_points = 0
     days_imported = 0
-    consecutive_net_failures = 0
+    days_failed = 0
+    consecutive_empty = 0
+    # Snapshot from previous runs — updated live on tracker, but the
+    # probe heuristic must not treat every day older than the one just
+    # processed as suspect
+    earliest_known = tracker.earliest_data
+    prefer_split = False
+    split_days = 0
     phone_lost = False
+    hae = HaeClient(args.hae_host, args.hae_port)
+    # The 4 windows of a day are independent I/O-bound queries; each worker
+    # opens its own connection, so they fan out cleanly
+    pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="hae")
+
+    def fetch_window(day: date, window: tuple) -> tuple[list[str], float]:
+        """Query one 6-hour window and return (lines, query_duration)."""
+        sh, sm, ss, eh, em, es = window
+        start_ts = format_hae_timestamp(day, sh, sm, ss, args.tz_offset)
+        end_ts = format_hae_timestamp(day, eh, em, es, args.tz_offset)
+        t0 = time.monotonic()
+        response = query_with_retry(hae, start_ts, end_ts, metrics=args.metrics, max_delay=args.max_delay)
+        query_dur = time.monotonic() - t0
+        return build_lines(extract_metrics(response)), query_dur
 
     try:
-        for i, day in enumerate(remaining):
-            if _interrupted:
+        for i, (day, day_iso) in enumerate(remaining):
+            if _stop.is_set():
                 break
 
             # Split each day into 6-hour windows to reduce per-request payload
@@ -598,58 +1015,88 @@ def import_pass(args, tracker: ProgressTracker) -> tuple[int, int, int, bool]:
             ]
 
             try:
-                day_points = 0
+                day_point_batch: list[str] = []
                 query_total = 0.0
                 write_total = 0.0
                 day_start = time.monotonic()
 
-                for sh, sm, ss, eh, em, es in windows:
-                    if _interrupted:
-                        break
-
-                    start_ts = format_hae_timestamp(day, sh, sm, ss, args.tz_offset)
-                    end_ts = format_hae_timestamp(day, eh, em, es, args.tz_offset)
+                # Days older than the earliest known data, or following an
+                # empty day while walking backwards, are probably empty too —
+                # always take the single-query path for those
+                probe_suspect = consecutive_empty > 0 or (
+                    earliest_known is not None and day_iso < earliest_known
+                )
 
-                    t0 = time.monotonic()
-                    response = query_with_retry(
-                        args.hae_host,
-                        args.hae_port,
-                        start_ts,
-                        end_ts,
-                        metrics=args.metrics,
-                    )
-                    query_total += time.monotonic() - t0
-
-                    metrics = extract_metrics(response)
-                    points = build_points(metrics)
-
-                    if points and not args.dry_run:
-                        t0 = time.monotonic()
-                        write_points(
-                            points,
-                            args.influx_url,
-                            args.influx_token,
-                            args.influx_org,
-                            args.influx_bucket,
+                # Whole-day-first: one query is the fast path; the 4x6h
+                # split only pays off when responses are actually heavy
+                use_whole_day = probe_suspect or not prefer_split
+                if use_whole_day:
+                    try:
+                        points, query_dur = fetch_window(day, _WHOLE_DAY)
+                    except socket.timeout:
+                        if probe_suspect:
+                            raise
+                        log.info("%s  whole-day query timed out — splitting into 6h windows", day)
+                        prefer_split = True
+                        split_days = 0
+                        use_whole_day = False
+                    else:
+                        query_total += query_dur
+                        day_point_batch.extend(points)
+                        breaker.on_success()
+                        nbytes = hae.last_response_size
+
+                        log.info(
+                            "%s  whole-day  %6d pts  (%.1f MB in %.1fs)",
+                            day, len(points), nbytes / 1e6, query_dur,
+                        )
+                        if not probe_suspect and (nbytes > _SPLIT_BYTES or query_dur > _SPLIT_SECONDS):
+                            log.info(
+                                "Heavy day (%.1f MB, %.1fs) — switching to 6h windows.",
+                                nbytes / 1e6, query_dur,
+                            )
+                            prefer_split = True
+                            split_days = 0
+
+                if not use_whole_day:
+                    split_days += 1
+                    if split_days >= _SPLIT_RETRY_DAYS:
+                        # Re-try the single-query fast path periodically
+                        prefer_split = False
+                    futures = [pool.submit(fetch_window, day, w) for w in windows]
+                    for window, future in zip(windows, futures):
+                        points, query_dur = future.result()
+                        query_total += query_dur
+                        day_point_batch.extend(points)
+                        breaker.on_success()
+
+                        log.info(
+                            "%s  %02d:00-%02d:59  %6d pts",
+                            day, window[0], window[3], len(points),
                         )
-                        write_total += time.monotonic() - t0
-
-                    day_points += len(points)
-                    consecutive_net_failures = 0
 
-                    log.info(
-                        "%s  %02d:00-%02d:59  %6d pts",
-                        day, sh, eh, len(points),
-                    )
+                # One write per day instead of one per window — collapses
+                # four round trips into a single batched request
+                day_points = len(day_point_batch)
+                if day_point_batch and not args.dry_run:
+                    t0 = time.monotonic()
+                    write_points(write_api, args.influx_bucket, day_point_batch)
+                    write_total = time.monotonic() - t0
 
                 day_elapsed = time.monotonic() - day_start
 
+                if day_points:
+                    consecutive_empty = 0
+                    tracker.note_earliest_data(day_iso)
+                else:
+                    consecutive_empty += 1
+
                 tracker.mark_completed(day, day_points)
                 days_imported += 1
                 total_points += day_points
 
                 write_telemetry(
-                    args, tracker, day, day_points,
+                    args, telemetry, tracker, day, day_points,
                     query_total, write_total, day_elapsed, total_days,
                 )
 
@@ -664,31 +1111,55 @@ def import_pass(args, tracker: ProgressTracker) -> tuple[int, int, int, bool]:
                     day_elapsed,
                 )
 
+                # Walking backwards from known data into a long empty
+                # stretch: assume everything older predates the user's
+                # Apple Health history and skip querying it entirely
+                if (
+                    consecutive_empty >= _EMPTY_TAIL_DAYS
+                    and tracker.earliest_data is not None
+                    and i + 1 < len(remaining)
+                ):
+                    tail = remaining[i + 1:]
+                    log.info(
+                        "%d consecutive empty days before %s — marking %d older days complete without querying.",
+                        consecutive_empty,
+                        tracker.earliest_data,
+                        len(tail),
+                    )
+                    for tail_day, _ in tail:
+                        tracker.mark_completed(tail_day, 0)
+                    days_imported += len(tail)
+                    break
+
             except (ConnectionRefusedError, socket.timeout, OSError) as e:
-                consecutive_net_failures += 1
+                days_failed += 1
+                breaker.on_failure()
                 log.warning(
                     "%s  FAILED (network): %s",
                     day,
                     e,
                 )
-                write_error(args, day, str(e))
-                if consecutive_net_failures >= 3:
-                    log.warning("Phone unreachable after %d consecutive failures.", consecutive_net_failures)
+                write_error(args, telemetry, day, str(e))
+                if breaker.is_open:
+                    log.warning("Phone unreachable — circuit breaker open, ending pass.")
                     phone_lost = True
-                    write_connectivity(args, online=False)
+                    write_connectivity(args, telemetry, online=False)
                     break
             except Exception as e:
+                days_failed += 1
                 log.error("%s  FAILED: %s", day, e)
-                write_error(args, day, str(e))
+                write_error(args, telemetry, day, str(e))
 
-            # Save progress after every day
+            # Save progress periodically (always on pass end/interrupt)
             tracker.save_if_dirty()
 
-            if args.delay > 0 and not _interrupted:
-                time.sleep(args.delay)
+            if args.delay > 0 and not _stop.is_set():
+                _stop.wait(args.delay)
 
     finally:
-        tracker.save_if_dirty()
+        pool.shutdown()
+        tracker.save_if_dirty(force=True)
+        telemetry.flush()
 
     log.info(
         "Pass complete. Imported %d days (%d points).",
@@ -696,12 +1167,10 @@ def import_pass(args, tracker: ProgressTracker) -> tuple[int, int, int, bool]:
         total_points,
     )
 
-    return days_imported, total_points, consecutive_net_failures, phone_lost
+    return days_imported, total_points, days_failed, phone_lost
 
 
 def main() -> None:
-    global _interrupted
-
     # Load .env from script directory
     load_dotenv(Path(__file__).parent / ".env")
     # Also try repo root .env
@@ -716,22 +1185,40 @@ def main() -> None:
     )
 
     def handle_interrupt(sig, frame):
-        global _interrupted
-        _interrupted = True
+        _stop.set()
         log.info("\nInterrupt received, finishing current day...")
 
     signal.signal(signal.SIGINT, handle_interrupt)
 
-    tracker = ProgressTracker(args.progress_file)
+    tracker = ProgressTracker(args.progress_file, save_every=args.save_every)
     if args.reset:
         tracker.reset()
     tracker.load()
 
+    # One client for the whole run (all passes, telemetry included)
+    client = None
+    write_api = None
+    if not args.dry_run:
+        client, write_api = make_influx_writer(args)
+
+    telemetry = TelemetryBuffer(write_api, args.influx_bucket)
+
+    try:
+        run(args, tracker, write_api, telemetry)
+    finally:
+        # Flush whatever telemetry is still buffered before closing
+        telemetry.flush()
+        if client is not None:
+            client.close()
+
+
+def run(args, tracker: ProgressTracker, write_api, telemetry: TelemetryBuffer) -> None:
+    """Run one-shot or daemon mode with the shared write API."""
     if not args.daemon:
         # One-shot mode (original behavior)
-        days_imported, total_points, days_failed, _ = import_pass(args, tracker)
-        all_days = list(date_range_reverse(args.start, args.end))
-        completed_total = len([d for d in all_days if tracker.is_completed(d)])
+        days_imported, total_points, days_failed, _ = import_pass(args, tracker, write_api, telemetry)
+        all_days = all_days_reverse(args.start, args.end)
+        completed_total = sum(1 for _, iso in all_days if iso in tracker.completed)
         total = len(all_days)
         log.info(
             "Done. Imported %d days (%d points). Total progress: %d/%d days (%.0f%%). Failed: %d.",
@@ -747,19 +1234,29 @@ def main() -> None:
     # Daemon mode — keep trying until historical backfill is complete
     log.info("Starting daemon (poll interval: %ds)", args.poll_interval)
     was_online = False
-
-    while not _interrupted:
-        if check_phone_reachable(args.hae_host, args.hae_port):
+    # Shared breaker across passes so an overnight outage backs the polls
+    # off instead of probing every poll_interval forever
+    breaker = CircuitBreaker()
+
+    while not _stop.is_set():
+        sleep_s = float(args.poll_interval)
+
+        if not breaker.allow_request():
+            remaining_s = breaker.opened_at + breaker.open_for - time.monotonic()
+            log.info("Circuit breaker open — next probe in %.0fs", remaining_s)
+            sleep_s = min(sleep_s, max(remaining_s, 1.0))
+        elif check_phone_reachable(args.hae_host, args.hae_port):
+            breaker.on_success()
             if not was_online:
                 log.info("Phone came online at %s:%d", args.hae_host, args.hae_port)
-                write_connectivity(args, online=True)
+                write_connectivity(args, telemetry, online=True)
                 was_online = True
 
             log.info("Phone reachable at %s:%d — starting import pass", args.hae_host, args.hae_port)
             tracker.load()  # reload in case of external edits
-            days_imported, total_points, _, phone_lost = import_pass(args, tracker)
+            days_imported, total_points, _, phone_lost = import_pass(args, tracker, write_api, telemetry, breaker)
 
-            if _interrupted:
+            if _stop.is_set():
                 break
 
             if phone_lost:
@@ -771,17 +1268,17 @@ def main() -> None:
             else:
                 log.info("Pass finished. Sleeping %ds before next check.", args.poll_interval)
         else:
+            breaker.on_failure()
             if was_online:
                 log.info("Phone went offline.")
-                write_connectivity(args, online=False)
+                write_connectivity(args, telemetry, online=False)
                 was_online = False
             log.info("Phone not reachable at %s:%d. Sleeping %ds.", args.hae_host, args.hae_port, args.poll_interval)
 
-        # Sleep in small increments so Ctrl+C is responsive
-        for _ in range(args.poll_interval):
-            if _interrupted:
-                break
-            time.sleep(1)
+        # Jitter the poll by ±20% so restarting daemons don't probe the
+        # phone in lockstep; Event.wait returns immediately on SIGINT
+        if _stop.wait(sleep_s * random.uniform(0.8, 1.2)):
+            break
 
     log.info("Daemon stopped.")
 
@@ -5,41 +5,161 @@ Reads import_progress.json and systemd service status to produce a concise
 progress report suitable for the chat assistant.
 
 Usage:
-    python3 import_status.py          # human-readable report
-    python3 import_status.py --json   # machine-readable JSON
+    python3 import_status.py               # human-readable report
+    python3 import_status.py --json        # machine-readable JSON
+    python3 import_status.py --no-service  # skip the systemd status lookup
+    python3 import_status.py --serve       # answer queries on a Unix socket
 """
 
+import base64
 import json
+import marshal
+import os
+import socket
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timezone
 from pathlib import Path
 
 
 PROGRESS_FILE = Path(__file__).parent / "import_progress.json"
+# Parsed-progress sidecar, keyed on the JSON file's (mtime_ns, size)
+CACHE_FILE = PROGRESS_FILE.with_suffix(".cache")
 SERVICE_NAME = "health-backfill"
 DEFAULT_START = date(2015, 1, 1)
+DEFAULT_START_ORD = DEFAULT_START.toordinal()
+
+# orjson serializes several times faster than stdlib json; matters when
+# --json carries a multi-thousand-entry gap list
+try:
+    import orjson
+
+    def _dumps_indented(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    def _dumps_indented(obj) -> str:
+        return json.dumps(obj, indent=2)
+
+# pystemd reads unit properties over D-Bus directly — one socket round
+# trip instead of fork+exec of systemctl plus output parsing
+try:
+    from pystemd.systemd1 import Unit as _SystemdUnit
+except ImportError:
+    _SystemdUnit = None
+
+
+def _bitset_decode(base_iso: str, bits_b64: str) -> list[int]:
+    """Unpack a (base date, base64 bitmap) progress entry into sorted day
+    ordinals (mirrored from backfill_health.py)."""
+    base = date.fromisoformat(base_iso).toordinal()
+    ords = []
+    for byte_i, byte in enumerate(base64.b64decode(bits_b64)):
+        if byte:
+            for bit in range(8):
+                if byte & (1 << bit):
+                    ords.append(base + byte_i * 8 + bit)
+    return ords
 
 
 def load_progress() -> dict:
+    """Load the progress file, with a marshal sidecar to skip reparsing.
+
+    Polling callers (chat assistant, watch loops) invoke this script far
+    more often than the progress file changes. The sidecar stores the
+    parsed dict plus pre-sorted day ordinals keyed on the JSON file's
+    (mtime_ns, size); a hit costs one stat() and a marshal.load instead
+    of a full JSON parse and per-day date parsing.
+    """
     if not PROGRESS_FILE.exists():
         return {"completed_days": [], "last_updated": None, "total_completed": 0}
-    return json.loads(PROGRESS_FILE.read_text())
+
+    stat = PROGRESS_FILE.stat()
+    key = (stat.st_mtime_ns, stat.st_size)
+    try:
+        with CACHE_FILE.open("rb") as f:
+            cached_key, data = marshal.load(f)
+        if tuple(cached_key) == key:
+            return data
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    data = json.loads(PROGRESS_FILE.read_text())
+    if data.get("bits_b64") and data.get("base"):
+        # Bitset format: base date + packed one-bit-per-day bitmap
+        data["completed_ordinals"] = _bitset_decode(data["base"], data["bits_b64"])
+    else:
+        # Set-dedup while converting: restart races can leave duplicate
+        # entries in the legacy list, which would inflate every count
+        data["completed_ordinals"] = sorted(
+            {date.fromisoformat(s).toordinal() for s in data.get("completed_days", [])}
+        )
+    try:
+        tmp = CACHE_FILE.with_suffix(".cache.tmp")
+        with tmp.open("wb") as f:
+            marshal.dump((key, data), f)
+        os.replace(tmp, CACHE_FILE)
+    except OSError:
+        pass  # cache is best-effort; a read-only dir just means no speedup
+    return data
+
+
+def _dbus_service_status() -> dict:
+    """Read unit properties via pystemd (already typed, no text parsing)."""
+    info = {"active": False, "status": "unknown", "since": None, "pid": None}
+    with _SystemdUnit(f"{SERVICE_NAME}.service".encode(), _autoload=True) as unit:
+        active = unit.Unit.ActiveState.decode()
+        info["active"] = active == "active"
+        info["status"] = active
+        info["sub_status"] = unit.Unit.SubState.decode()
+        pid = unit.Service.MainPID
+        if pid:
+            info["pid"] = int(pid)
+        enter_us = unit.Unit.ActiveEnterTimestamp  # microseconds since epoch
+        if enter_us:
+            info["since"] = (
+                datetime.fromtimestamp(enter_us / 1e6, tz=timezone.utc)
+                .astimezone()
+                .strftime("%a %Y-%m-%d %H:%M:%S %Z")
+            )
+    return info
 
 
 def get_service_status() -> dict:
-    """Get systemd service status."""
+    """Get systemd service status.
+
+    Prefers one D-Bus property read via pystemd; falls back to forking
+    systemctl (the dominant cost of a cold run) when pystemd is missing
+    or the bus is unavailable.
+    """
+    if _SystemdUnit is not None:
+        try:
+            return _dbus_service_status()
+        except Exception:
+            pass
     info = {"active": False, "status": "unknown", "since": None, "pid": None}
     try:
+        # No stdin pipe and a minimal environment keep the fork cheap;
+        # the user-bus variables must survive or `--user` can't find the
+        # session manager. No preexec_fn, so subprocess stays on its
+        # posix_spawn fast path.
+        env = {"LANG": "C", "PATH": "/usr/bin:/bin"}
+        for var in ("XDG_RUNTIME_DIR", "DBUS_SESSION_BUS_ADDRESS"):
+            if var in os.environ:
+                env[var] = os.environ[var]
         result = subprocess.run(
             ["systemctl", "--user", "show", SERVICE_NAME,
              "--property=ActiveState,SubState,MainPID,ActiveEnterTimestamp"],
-            capture_output=True, text=True, timeout=5
+            capture_output=True, text=True, timeout=5,
+            stdin=subprocess.DEVNULL, env=env,
         )
-        for line in result.stdout.strip().split("\n"):
-            if "=" not in line:
+        # splitlines avoids the stripped intermediate copy and partition
+        # splits in one pass without the substring containment pre-check
+        for line in result.stdout.splitlines():
+            key, sep, val = line.partition("=")
+            if not sep:
                 continue
-            key, val = line.split("=", 1)
             if key == "ActiveState":
                 info["active"] = val == "active"
                 info["status"] = val
@@ -54,55 +174,134 @@ def get_service_status() -> dict:
     return info
 
 
-def compute_stats(progress: dict) -> dict:
-    completed_days = sorted(progress.get("completed_days", []))
-    total_completed = len(completed_days)
+def _count_gaps(ords: list[int]) -> int:
+    """Count missing days within the completed range (integer arithmetic only)."""
+    if len(ords) < 2 or ords[-1] - ords[0] + 1 == len(ords):
+        return 0
+    return sum(b - a - 1 for a, b in zip(ords, ords[1:]))
+
+
+def _list_gaps(ords: list[int], limit: int | None = None) -> list[str]:
+    """List missing days within the completed range as ISO strings, at most
+    `limit` of them (None for all)."""
+    gap_ords = []
+    if len(ords) >= 2 and ords[-1] - ords[0] + 1 != len(ords):
+        for a, b in zip(ords, ords[1:]):
+            if b - a > 1:
+                gap_ords.extend(range(a + 1, b))
+                if limit is not None and len(gap_ords) >= limit:
+                    break
+    if limit is not None:
+        gap_ords = gap_ords[:limit]
+    return [date.fromordinal(o).isoformat() for o in gap_ords]
+
+
+def _cached_service_status(ttl: float = 2.0) -> dict:
+    """get_service_status() with a short-lived tmpfs cache.
+
+    Polling callers re-run this script faster than the unit state
+    changes; a fresh cache file (mtime within `ttl`) skips the D-Bus
+    round trip / systemctl fork entirely.
+    """
+    cache = Path(f"/run/user/{os.getuid()}") / f"{SERVICE_NAME}-status.json"
+    try:
+        if time.time() - cache.stat().st_mtime < ttl:
+            return json.loads(cache.read_bytes())
+    except (OSError, ValueError):
+        pass
+    info = get_service_status()
+    try:
+        tmp = cache.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(info))
+        os.replace(tmp, cache)
+    except OSError:
+        pass  # no tmpfs dir (e.g. no user session) just means no caching
+    return info
+
+
+def _gap_ranges(ords: list[int]) -> list:
+    """Missing days as merged ranges: a lone missing day is a single ISO
+    string, a run is a ["start", "end"] pair.
+
+    Each hole between adjacent completed days is already one contiguous
+    run, so the ranges fall straight out of the pair scan — no separate
+    folding pass. For a 10K-day gap this shrinks the JSON payload from
+    10K strings to one pair.
+    """
+    ranges = []
+    if len(ords) >= 2 and ords[-1] - ords[0] + 1 != len(ords):
+        for a, b in zip(ords, ords[1:]):
+            if b - a == 2:
+                ranges.append(date.fromordinal(a + 1).isoformat())
+            elif b - a > 2:
+                ranges.append([
+                    date.fromordinal(a + 1).isoformat(),
+                    date.fromordinal(b - 1).isoformat(),
+                ])
+    return ranges
+
+
+def compute_stats(progress: dict, include_gaps: bool = False) -> dict:
+    # Day ordinals are the working representation — load_progress
+    # precomputes them for both the bitset and legacy list formats
+    ords = progress.get("completed_ordinals")
+    if ords is None:
+        ords = sorted(
+            {date.fromisoformat(s).toordinal() for s in progress.get("completed_days", [])}
+        )
+    total_completed = len(ords)
     last_updated = progress.get("last_updated")
+    # The daemon also stores the epoch form — diffing against time.time()
+    # skips the fromisoformat/datetime round trips below
+    last_epoch = progress.get("last_updated_epoch")
 
+    # All range math in ordinal (int) space — no timedelta intermediates
     today = date.today()
-    total_days = (today - DEFAULT_START).days + 1
+    today_ord = today.toordinal()
+    total_days = today_ord - DEFAULT_START_ORD + 1
     remaining = total_days - total_completed
 
     # Date coverage
-    earliest = completed_days[0] if completed_days else None
-    latest = completed_days[-1] if completed_days else None
-
-    # Gaps (missing days within the completed range)
-    gaps = []
-    if len(completed_days) >= 2:
-        completed_set = set(completed_days)
-        range_start = date.fromisoformat(earliest)
-        range_end = date.fromisoformat(latest)
-        d = range_start
-        from datetime import timedelta
-        while d <= range_end:
-            if d.isoformat() not in completed_set:
-                gaps.append(d.isoformat())
-            d += timedelta(days=1)
+    earliest = date.fromordinal(ords[0]).isoformat() if ords else None
+    latest = date.fromordinal(ords[-1]).isoformat() if ords else None
+
+    # Gaps (missing days within the completed range). The count is always
+    # cheap integer arithmetic. The text report previews the first 5
+    # individual days; --json gets the range-merged form, so a
+    # thousand-day hole is one ["start", "end"] pair instead of a
+    # thousand strings.
+    gap_count = _count_gaps(ords)
+    gaps = _gap_ranges(ords) if include_gaps else _list_gaps(ords, limit=5)
 
     # Rate calculation — average days imported per calendar day since first import
     rate_per_day = None
     eta_days = None
-    if last_updated and total_completed > 1 and earliest:
-        first_import = date.fromisoformat(earliest)
-        last_update_dt = datetime.fromisoformat(last_updated)
-        elapsed_calendar_days = (last_update_dt.date() - first_import).days or 1
+    if total_completed > 1 and (last_epoch or last_updated):
+        if last_epoch:
+            last_ord = date.fromtimestamp(last_epoch).toordinal()
+        else:
+            last_ord = datetime.fromisoformat(last_updated).date().toordinal()
+        elapsed_calendar_days = (last_ord - ords[0]) or 1
         rate_per_day = total_completed / elapsed_calendar_days
         if rate_per_day > 0 and remaining > 0:
             eta_days = int(remaining / rate_per_day)
 
     # Time since last update
     since_last = None
-    if last_updated:
-        last_dt = datetime.fromisoformat(last_updated)
-        delta = datetime.now(timezone.utc) - last_dt
-        hours = delta.total_seconds() / 3600
+    if last_epoch:
+        delta_s = time.time() - last_epoch
+    elif last_updated:
+        delta_s = (datetime.now(timezone.utc) - datetime.fromisoformat(last_updated)).total_seconds()
+    else:
+        delta_s = None
+    if delta_s is not None:
+        hours = delta_s / 3600
         if hours < 1:
-            since_last = f"{int(delta.total_seconds() / 60)}m ago"
+            since_last = f"{int(delta_s / 60)}m ago"
         elif hours < 24:
             since_last = f"{hours:.1f}h ago"
         else:
-            since_last = f"{delta.days}d ago"
+            since_last = f"{int(hours / 24)}d ago"
 
     pct = (total_completed / total_days * 100) if total_days > 0 else 0
 
@@ -116,7 +315,7 @@ def compute_stats(progress: dict) -> dict:
         "earliest_imported": earliest,
         "latest_imported": latest,
         "gaps_in_completed_range": gaps,
-        "gap_count": len(gaps),
+        "gap_count": gap_count,
         "last_updated": last_updated,
         "since_last_update": since_last,
         "rate_days_per_day": round(rate_per_day, 1) if rate_per_day else None,
@@ -124,12 +323,23 @@ def compute_stats(progress: dict) -> dict:
     }
 
 
-def format_report(stats: dict, service: dict) -> str:
-    lines = []
-    lines.append("=== Health Data Import Status ===")
-    lines.append("")
+# Report templates, constant-folded at import time so the block helpers
+# only format the variable parts
+_HEADER = "=== Health Data Import Status ==="
+_TMPL_SERVICE = "Service:    {status}"
+_TMPL_PROGRESS = (
+    "Progress:   {done}/{total} days ({pct}%)\n"
+    "Remaining:  {remaining} days\n"
+    "Date range: {start} to {end}"
+)
+_TMPL_IMPORTED = "Imported:   {earliest} through {latest}"
+_TMPL_GAPS = "Gaps:       {count} missing day(s): {preview}"
+_TMPL_RATE = "Rate:       ~{rate} days imported per calendar day"
+_TMPL_ETA = "ETA:        ~{eta} days to complete at current rate"
+_TMPL_LAST = "Last update: {since}"
+
 
-    # Service status
+def _service_block(service: dict) -> str:
     status_str = service.get("status", "unknown")
     sub = service.get("sub_status", "")
     if sub:
@@ -138,49 +348,136 @@ def format_report(stats: dict, service: dict) -> str:
         status_str += f", PID {service['pid']}"
     if service.get("since"):
         status_str += f", since {service['since']}"
-    lines.append(f"Service:    {status_str}")
-    lines.append("")
+    return _TMPL_SERVICE.format(status=status_str)
+
+
+def _progress_block(stats: dict) -> str:
+    return _TMPL_PROGRESS.format(
+        done=stats["completed"],
+        total=stats["total_days_in_range"],
+        pct=stats["percent_complete"],
+        remaining=stats["remaining"],
+        start=stats["range_start"],
+        end=stats["range_end"],
+    )
 
-    # Progress
-    lines.append(f"Progress:   {stats['completed']}/{stats['total_days_in_range']} days ({stats['percent_complete']}%)")
-    lines.append(f"Remaining:  {stats['remaining']} days")
-    lines.append(f"Date range: {stats['range_start']} to {stats['range_end']}")
-    lines.append("")
 
-    # Coverage
+def _coverage_block(stats: dict) -> str:
+    lines = []
     if stats["earliest_imported"] and stats["latest_imported"]:
-        lines.append(f"Imported:   {stats['earliest_imported']} through {stats['latest_imported']}")
+        lines.append(_TMPL_IMPORTED.format(
+            earliest=stats["earliest_imported"], latest=stats["latest_imported"]
+        ))
     if stats["gap_count"] > 0:
         gap_preview = ", ".join(stats["gaps_in_completed_range"][:5])
         if stats["gap_count"] > 5:
             gap_preview += f" ... (+{stats['gap_count'] - 5} more)"
-        lines.append(f"Gaps:       {stats['gap_count']} missing day(s): {gap_preview}")
-    lines.append("")
+        lines.append(_TMPL_GAPS.format(count=stats["gap_count"], preview=gap_preview))
+    return "\n".join(lines)
+
 
-    # Rates
+def _rates_block(stats: dict) -> str:
+    lines = []
     if stats["rate_days_per_day"]:
-        lines.append(f"Rate:       ~{stats['rate_days_per_day']} days imported per calendar day")
+        lines.append(_TMPL_RATE.format(rate=stats["rate_days_per_day"]))
     if stats["estimated_days_to_complete"]:
-        lines.append(f"ETA:        ~{stats['estimated_days_to_complete']} days to complete at current rate")
-    lines.append("")
+        lines.append(_TMPL_ETA.format(eta=stats["estimated_days_to_complete"]))
+    return "\n".join(lines)
 
-    # Last contact
+
+def _last_block(stats: dict) -> str:
     if stats["since_last_update"]:
-        lines.append(f"Last update: {stats['since_last_update']}")
+        return _TMPL_LAST.format(since=stats["since_last_update"])
+    return ""
 
-    return "\n".join(lines)
+
+def format_report(stats: dict, service: dict) -> str:
+    """Assemble the report from section blocks; empty sections drop out."""
+    parts = [
+        _HEADER,
+        _service_block(service),
+        _progress_block(stats),
+        _coverage_block(stats),
+        _rates_block(stats),
+        _last_block(stats),
+    ]
+    return "\n\n".join(p for p in parts if p)
+
+
+def serve() -> None:
+    """Answer status queries over a Unix socket from one long-lived process.
+
+    For a polling chat assistant the per-invocation cost is dominated by
+    interpreter startup, not the report itself; this amortizes it to one
+    socket round trip per query. Each connection yields one report — the
+    client sends ``json`` for the JSON form, anything else (or an
+    immediate EOF) for the text report. Staleness is handled by the
+    existing caches: load_progress stats the progress file per query and
+    the service-status cache expires on its own TTL.
+    """
+    path = Path(f"/run/user/{os.getuid()}") / "health-ingester-status.sock"
+    try:
+        path.unlink()
+    except OSError:
+        pass
+    srv = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    srv.bind(str(path))
+    srv.listen(4)
+    print(f"Serving status on {path}", file=sys.stderr)
+    try:
+        while True:
+            conn, _ = srv.accept()
+            with conn:
+                conn.settimeout(2)
+                try:
+                    req = conn.recv(64)
+                except OSError:
+                    req = b""
+                as_json = req.strip().lower().startswith(b"json")
+                stats = compute_stats(load_progress(), include_gaps=as_json)
+                service = _cached_service_status()
+                if as_json:
+                    body = _dumps_indented({**stats, "service": service})
+                else:
+                    body = format_report(stats, service)
+                try:
+                    conn.sendall(body.encode() + b"\n")
+                except OSError:
+                    pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.close()
+        try:
+            path.unlink()
+        except OSError:
+            pass
 
 
 def main():
+    if "--serve" in sys.argv:
+        serve()
+        return
+
     as_json = "--json" in sys.argv
+    no_service = "--no-service" in sys.argv
+
+    # The progress parse and the service lookup are independent — overlap
+    # them so wall time is the max of the two, not the sum
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        f_progress = ex.submit(load_progress)
+        f_service = None if no_service else ex.submit(_cached_service_status)
+        progress = f_progress.result()
+        if f_service is not None:
+            service = f_service.result()
+        else:
+            service = {"active": False, "status": "skipped", "since": None, "pid": None}
 
-    progress = load_progress()
-    stats = compute_stats(progress)
-    service = get_service_status()
+    stats = compute_stats(progress, include_gaps=as_json)
 
     if as_json:
         output = {**stats, "service": service}
-        print(json.dumps(output, indent=2))
+        print(_dumps_indented(output))
     else:
         print(format_report(stats, service))
 